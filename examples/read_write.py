@@ -16,27 +16,49 @@
 # under the License.
 
 import asyncio
-import datetime
+import os
+import sys
+import time
 from horaedb_client import Builder, RpcContext, PointBuilder, ValueBuilder, WriteRequest, SqlQueryRequest, Mode, RpcConfig, Authorization
 
-
-def create_table(ctx):
-    create_table_sql = 'CREATE TABLE IF NOT EXISTS demo ( \
-        name string TAG, \
-        value double, \
-        t timestamp NOT NULL, \
-        TIMESTAMP KEY(t)) ENGINE=Analytic with (enable_ttl=false)'
-
-    req = SqlQueryRequest(['demo'], create_table_sql)
-    _resp = sync_query(client, ctx, req)
+# The event loop shared by the sync helpers, so that it is created only once
+# instead of being fetched for every request. uvloop is optional, it makes the
+# loop cheaper to drive if installed.
+try:
+    import uvloop
+    _LOOP = uvloop.new_event_loop()
+except ImportError:
+    _LOOP = asyncio.new_event_loop()
+
+# The example writes NUM_BATCHES requests of BATCH_SIZE points each.
+NUM_BATCHES = 4
+BATCH_SIZE = 10
+
+# ValueBuilder holds no state, so one instance is shared by all the points.
+VALUE_BUILDER = ValueBuilder()
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS demo (
+    name string TAG,
+    value double,
+    t timestamp NOT NULL,
+    TIMESTAMP KEY(t)) ENGINE=Analytic with (enable_ttl=false)
+"""
+
+DROP_TABLE_SQL = 'DROP TABLE demo'
+
+
+# The DDL statements are one-shot requests with nothing to overlap with, so they
+# are deliberately issued synchronously; only the write/read path is async.
+def create_table(cli, ctx):
+    req = SqlQueryRequest(['demo'], CREATE_TABLE_SQL)
+    _resp = sync_query(cli, ctx, req)
     print("Create table success!")
 
 
-def drop_table(ctx):
-    drop_table_sql = 'DROP TABLE demo'
-
-    req = SqlQueryRequest(['demo'], drop_table_sql)
-    _resp = sync_query(client, ctx, req)
+def drop_table(cli, ctx):
+    req = SqlQueryRequest(['demo'], DROP_TABLE_SQL)
+    _resp = sync_query(cli, ctx, req)
     print("Drop table success!")
 
 
@@ -45,47 +67,80 @@ async def async_query(cli, ctx, req):
 
 
 def sync_query(cli, ctx, req):
-    event_loop = asyncio.get_event_loop()
-    return event_loop.run_until_complete(async_query(cli, ctx, req))
+    return _LOOP.run_until_complete(async_query(cli, ctx, req))
 
 
 def process_query_resp(resp):
     print(f"Raw resp is:\n{resp}\n")
 
-    print(f"Access row by index in the resp:")
-    for row_idx in range(0, resp.num_rows()):
-        row_tokens = []
-        row = resp.row_by_idx(row_idx)
-        for col_idx in range(0, row.num_cols()):
+    print(f"Access row by iter in the resp:")
+    lines = []
+    for row_idx, row in enumerate(resp.iter_rows()):
+        row_line = ",".join(
+            f"{col.name()}:{col.value()}#{col.data_type()}"
+            for col in row.iter_columns())
+        lines.append(f"row#{row_idx}: {row_line}\n")
+    sys.stdout.writelines(lines)
+
+    # Rows and columns can also be accessed randomly by index.
+    print(f"Access the first row by index in the resp:")
+    if resp.num_rows() > 0:
+        row = resp.row_by_idx(0)
+        for col_idx in range(row.num_cols()):
             col = row.column_by_idx(col_idx)
-            row_tokens.append(f"{col.name()}:{col.value()}#{col.data_type()}")
-        print(f"row#{row_idx}: {','.join(row_tokens)}")
+            print(f"{col.name()}:{col.value()}#{col.data_type()}")
 
-    print(f"Access row by iter in the resp:")
-    for row in resp.iter_rows():
-        row_tokens = []
-        for col in row.iter_columns():
-            row_tokens.append(f"{col.name()}:{col.value()}#{col.data_type()}")
-        print(f"row: {','.join(row_tokens)}")
 
+def process_write_resp(resp):
+    print("success:{}, failed:{}".format(
+        resp.get_success(), resp.get_failed()))
 
-async def async_write(cli, ctx, req):
-    return await cli.write(ctx, req)
 
+def build_write_request(batch_idx):
+    # All points in a batch share one timestamp, they differ by tag.
+    timestamp_ms = time.time_ns() // 1_000_000
+    # One builder serves the whole batch by resetting it after every point.
+    # PointBuilder.reset() is not available in the published 2.0.0 wheel, with
+    # that wheel create a new PointBuilder per point instead.
+    point_builder = PointBuilder('demo')
+    points = []
+    for i in range(BATCH_SIZE):
+        point_builder.set_timestamp(timestamp_ms)
+        point_builder.set_tag(
+            "name", VALUE_BUILDER.string(f"test_tag{batch_idx}_{i}"))
+        point_builder.set_field("value", VALUE_BUILDER.double(0.4242 * i))
+        points.append(point_builder.build())
+        point_builder.reset()
+
+    # Send all the points in one request rather than one request per point.
+    write_request = WriteRequest()
+    write_request.add_points(points)
+    return write_request
 
-def sync_write(cli, ctx, req):
-    event_loop = asyncio.get_event_loop()
-    return event_loop.run_until_complete(async_write(cli, ctx, req))
 
+async def main(cli, ctx):
+    print("### write:")
+    # The batches are independent of each other, so write them concurrently.
+    write_requests = [build_write_request(i) for i in range(NUM_BATCHES)]
+    resps = await asyncio.gather(
+        *(cli.write(ctx, req) for req in write_requests))
+    for resp in resps:
+        process_write_resp(resp)
+    print("------------------------------------------------------------------")
 
-def process_write_resp(resp):
-    print("success:{}, failed:{}".format(
-        resp.get_success(), resp.get_failed()))
+    print("### read:")
+    req = SqlQueryRequest(['demo'], 'select * from demo')
+    resp = await cli.sql_query(ctx, req)
+    process_query_resp(resp)
+    print("------------------------------------------------------------------")
 
 
 if __name__ == "__main__":
     rpc_config = RpcConfig()
-    rpc_config.thread_num = 1
+    # Default to one thread per concurrent write batch, capped by the CPU
+    # count; HORAEDB_RPC_THREADS overrides it.
+    rpc_config.thread_num = int(os.environ.get(
+        "HORAEDB_RPC_THREADS", min(os.cpu_count() or 1, NUM_BATCHES)))
     rpc_config.default_write_timeout_ms = 1000
     builder = Builder("127.0.0.1:8831", Mode.Direct)
     builder.set_rpc_config(rpc_config)
@@ -98,31 +153,16 @@ if __name__ == "__main__":
     ctx.timeout_ms = 1000
     ctx.database = "public"
 
-    print("------------------------------------------------------------------")
-    print("### create table:")
-    create_table(ctx)
-    print("------------------------------------------------------------------")
-
-    print("### write:")
-    point_builder = PointBuilder('demo')
-    point_builder.set_timestamp(
-        int(round(datetime.datetime.now().timestamp())) * 1000)
-    point_builder.set_tag("name", ValueBuilder().string("test_tag1"))
-    point_builder.set_field("value", ValueBuilder().double(0.4242))
-    point = point_builder.build()
-
-    write_request = WriteRequest()
-    write_request.add_point(point)
-    resp = sync_write(client, ctx, write_request)
-    process_write_resp(resp)
-    print("------------------------------------------------------------------")
+    try:
+        print("------------------------------------------------------------------")
+        print("### create table:")
+        create_table(client, ctx)
+        print("------------------------------------------------------------------")
 
-    print("### read:")
-    req = SqlQueryRequest(['demo'], 'select * from demo')
-    resp = sync_query(client, ctx, req)
-    process_query_resp(resp)
-    print("------------------------------------------------------------------")
+        _LOOP.run_until_complete(main(client, ctx))
 
-    print("### drop table:")
-    drop_table(ctx)
-    print("------------------------------------------------------------------")
+        print("### drop table:")
+        drop_table(client, ctx)
+        print("------------------------------------------------------------------")
+    finally:
+        _LOOP.close()
@@ -104,6 +104,7 @@ class PointBuilder:
     def set_timestamp(self, timestamp_ms: int): ...
     def set_tag(self, name: str, val: Value): ...
     def set_field(self, name: str, val: Value): ...
+    def reset(self): ...
     def build(self) -> Point: ...
 
 
@@ -30,7 +30,10 @@ use horaedb_client::model::{
         Request as RustWriteRequest, Response as RustWriteResponse,
     },
 };
-use pyo3::{exceptions::PyTypeError, prelude::*};
+use pyo3::{
+    exceptions::{PyTypeError, PyValueError},
+    prelude::*,
+};
 
 pub fn register_py_module(m: &PyModule) -> PyResult<()> {
     m.add_class::<SqlQueryRequest>()?;
@@ -473,47 +476,77 @@ pub struct Point {
 /// The builder for [Point].
 #[pyclass]
 pub struct PointBuilder {
+    /// The table of the points to build, kept to reset the builder.
+    table: String,
     /// The underlying builder defined in rust.
     ///
     /// The option is a workaround to use the builder pattern of the
-    /// `RustPointBuilder`, and it is ensured to be `Some` all the time.
+    /// `RustPointBuilder`, and it is `Some` all the time except between a
+    /// `build` and the following `reset`, when the other methods raise a
+    /// `ValueError`.
     rust_builder: Option<RustPointBuilder>,
 }
 
+impl PointBuilder {
+    /// Take the underlying builder, failing if it has been consumed by a
+    /// `build` without a `reset` since.
+    fn take_rust_builder(&mut self) -> PyResult<RustPointBuilder> {
+        self.rust_builder
+            .take()
+            .ok_or_else(|| PyValueError::new_err("PointBuilder already built; call reset() first"))
+    }
+}
+
 #[pymethods]
 impl PointBuilder {
     #[new]
     pub fn new(table: String) -> Self {
         Self {
-            rust_builder: Some(RustPointBuilder::new(table)),
+            rust_builder: Some(RustPointBuilder::new(table.clone())),
+            table,
         }
     }
 
-    pub fn set_table(&mut self, table: String) {
-        let builder = self.rust_builder.take().unwrap().table(table);
+    pub fn set_table(&mut self, table: String) -> PyResult<()> {
+        let builder = self.take_rust_builder()?.table(table.clone());
         self.rust_builder = Some(builder);
+        self.table = table;
+
+        Ok(())
     }
 
-    pub fn set_timestamp(&mut self, timestamp: TimestampMs) {
-        let builder = self.rust_builder.take().unwrap().timestamp(timestamp);
+    /// Start a new point of the same table, discarding the timestamp, tags and
+    /// fields set so far, so that the builder can be reused after `build`.
+    pub fn reset(&mut self) {
+        self.rust_builder = Some(RustPointBuilder::new(self.table.clone()));
+    }
+
+    pub fn set_timestamp(&mut self, timestamp: TimestampMs) -> PyResult<()> {
+        let builder = self.take_rust_builder()?.timestamp(timestamp);
         self.rust_builder = Some(builder);
+
+        Ok(())
     }
 
-    pub fn set_tag(&mut self, name: String, val: Value) {
-        let builder = self.rust_builder.take().unwrap().tag(name, val.raw_val);
+    pub fn set_tag(&mut self, name: String, val: Value) -> PyResult<()> {
+        let builder = self.take_rust_builder()?.tag(name, val.raw_val);
         self.rust_builder = Some(builder);
+
+        Ok(())
     }
 
-    pub fn set_field(&mut self, name: String, val: Value) {
-        let builder = self.rust_builder.take().unwrap().field(name, val.raw_val);
+    pub fn set_field(&mut self, name: String, val: Value) -> PyResult<()> {
+        let builder = self.take_rust_builder()?.field(name, val.raw_val);
         self.rust_builder = Some(builder);
+
+        Ok(())
     }
 
+    /// Build the point, which consumes the builder until [Self::reset] is
+    /// called.
     pub fn build(&mut self) -> PyResult<Point> {
         let rust_point = self
-            .rust_builder
-            .take()
-            .unwrap()
+            .take_rust_builder()?
             .build()
             .map_err(PyTypeError::new_err)?;
 